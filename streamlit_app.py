@@ -1,7 +1,15 @@
+import os
+
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
 
+# Run Altair's data transforms (aggregation, binning) server-side in
+# VegaFusion's Rust engine and ship only the aggregated rows to the
+# browser, instead of inlining full datasets as JSON
+alt.data_transformers.enable("vegafusion")
+
 # --------------------------------------------------
 # Page configuration
 # --------------------------------------------------
@@ -15,7 +23,30 @@ st.set_page_config(
 # --------------------------------------------------
 @st.cache_data
 def load_data():
-    df = pd.read_csv("Enterprise_GenAI_Adoption_Impact.csv")
+    # Convert the CSV to Parquet once; every cold cache after that loads
+    # the compressed columnar file instead of re-parsing 18 MB of text.
+    # The typed CSV read bakes the schema into the Parquet file, and the
+    # categorical/int16/float32 dtypes round-trip through read_parquet.
+    parquet_path = "Enterprise_GenAI_Adoption_Impact.parquet"
+    if not os.path.exists(parquet_path):
+        pd.read_csv(
+            "Enterprise_GenAI_Adoption_Impact.csv",
+            engine="pyarrow",
+            dtype_backend="pyarrow",
+            dtype={
+                "Company Name": "category",
+                "Industry": "category",
+                "Country": "category",
+                "GenAI Tool": "category",
+                "Adoption Year": "int16",
+                "Number of Employees Impacted": "int32",
+                "New Roles Created": "int32",
+                "Training Hours Provided": "int32",
+                "Productivity Change (%)": "float32",
+            },
+        ).to_parquet(parquet_path, compression="zstd")
+
+    df = pd.read_parquet(parquet_path, engine="pyarrow")
 
     # Normalize column names so they are easy to use
     df = df.rename(
@@ -30,11 +61,102 @@ def load_data():
         }
     )
 
+    # Enforce the narrow numeric dtypes even when the Parquet file was
+    # written before the schema above existed (no-op otherwise). Halving
+    # column width halves scan bandwidth for every downstream reduction.
+    df = df.astype(
+        {
+            "Company_Name": "category",
+            "Adoption Year": "int16",
+            "Employees_Impacted": "int32",
+            "New_Roles_Created": "int32",
+            "Training_Hours": "int32",
+            "Productivity_Change": "float32",
+        }
+    )
+
+    # Keep the frame sorted by year so a year-range filter is a binary
+    # search for a contiguous slice rather than a full-column comparison
+    df = df.sort_values("Adoption Year", kind="stable").reset_index(drop=True)
+
     return df
 
 
 df = load_data()
 
+
+@st.cache_data
+def unique_sorted(col_name: str) -> list:
+    """Sorted unique values of a column, memoized so widget option lists
+    are not recomputed on every rerun."""
+    return sorted(df[col_name].unique().tolist())
+
+
+@st.cache_data
+def options_with_all(col_name: str, sentinel: str) -> list:
+    """unique_sorted() with a leading catch-all entry, memoized so the
+    concatenated list is not rebuilt on every rerun."""
+    return [sentinel] + unique_sorted(col_name)
+
+
+@st.cache_data
+def year_bounds() -> tuple:
+    years = df["Adoption Year"].to_numpy()
+    return int(years.min()), int(years.max())
+
+
+@st.cache_data(show_spinner=False)
+def apply_filters(inds: tuple, ctries: tuple, tls: tuple, y0: int, y1: int):
+    """Filtered view of df, memoized on the widget selections so reruns
+    that leave the filters untouched skip the masking entirely."""
+    # df is year-sorted at load time, so the year window is two binary
+    # searches for a contiguous slice; the isin masks then scan only that
+    # slice instead of the whole frame
+    lo, hi = np.searchsorted(df["Adoption Year"].to_numpy(), [y0, y1 + 1])
+    base = df.iloc[lo:hi]
+    mask = np.logical_and.reduce(
+        [
+            base["Industry"].isin(inds).to_numpy(),
+            base["Country"].isin(ctries).to_numpy(),
+            base["GenAI_Tool"].isin(tls).to_numpy(),
+        ]
+    )
+    return base.iloc[mask]
+
+
+@st.cache_data(show_spinner=False)
+def prod_cube(frame: pd.DataFrame) -> tuple:
+    """Productivity_Change sum and count per (Industry, Country) row and
+    GenAI_Tool column. Any industry/country slice reduces to summing a
+    few cube rows, so recommendation reruns never rescan the raw rows."""
+    g = frame.groupby(["Industry", "Country", "GenAI_Tool"], observed=False)[
+        "Productivity_Change"
+    ]
+    sums = g.sum().unstack("GenAI_Tool").fillna(0.0)
+    counts = g.count().unstack("GenAI_Tool").fillna(0).astype("int64")
+    return sums, counts
+
+
+@st.cache_data(show_spinner=False)
+def training_sorted(frame: pd.DataFrame) -> tuple:
+    """Training_Hours sorted ascending, with Productivity_Change reordered
+    to match, so a training-hours window is a searchsorted slice."""
+    th = frame["Training_Hours"].to_numpy()
+    order = np.argsort(th, kind="stable")
+    return th[order], frame["Productivity_Change"].to_numpy()[order]
+
+
+def group_sum_count(codes: np.ndarray, vals: np.ndarray, k: int) -> tuple:
+    """Per-category sum and count in one C-level pass over categorical codes.
+
+    Equivalent to groupby(col)[val].agg(["sum", "size"]) but skips the
+    pandas groupby machinery entirely.
+    """
+    sums = np.bincount(codes, weights=vals, minlength=k)
+    counts = np.bincount(codes, minlength=k)
+    return sums, counts
+
+
 # --------------------------------------------------
 # Sidebar filters
 # --------------------------------------------------
@@ -42,24 +164,23 @@ st.sidebar.title("Filters")
 
 industries = st.sidebar.multiselect(
     "Industry",
-    options=sorted(df["Industry"].unique()),
-    default=sorted(df["Industry"].unique()),
+    options=unique_sorted("Industry"),
+    default=unique_sorted("Industry"),
 )
 
 countries = st.sidebar.multiselect(
     "Country",
-    options=sorted(df["Country"].unique()),
-    default=sorted(df["Country"].unique()),
+    options=unique_sorted("Country"),
+    default=unique_sorted("Country"),
 )
 
 tools = st.sidebar.multiselect(
     "GenAI Tool",
-    options=sorted(df["GenAI_Tool"].unique()),
-    default=sorted(df["GenAI_Tool"].unique()),
+    options=unique_sorted("GenAI_Tool"),
+    default=unique_sorted("GenAI_Tool"),
 )
 
-min_year = int(df["Adoption Year"].min())
-max_year = int(df["Adoption Year"].max())
+min_year, max_year = year_bounds()
 
 year_range = st.sidebar.slider(
     "Adoption Year Range",
@@ -69,14 +190,27 @@ year_range = st.sidebar.slider(
     step=1,
 )
 
-# Apply filters
-filtered_df = df[
-    (df["Industry"].isin(industries))
-    & (df["Country"].isin(countries))
-    & (df["GenAI_Tool"].isin(tools))
-    & (df["Adoption Year"] >= year_range[0])
-    & (df["Adoption Year"] <= year_range[1])
-]
+# Apply filters. The default view — every value selected and the full
+# year range — is a no-op filter, so skip the masking and the row copy
+# and use df as-is. Selections are passed as sorted tuples so the cache
+# key does not depend on the order values were clicked in.
+full_selection = (
+    len(industries) == df["Industry"].cat.categories.size
+    and len(countries) == df["Country"].cat.categories.size
+    and len(tools) == df["GenAI_Tool"].cat.categories.size
+    and year_range == (min_year, max_year)
+)
+
+if full_selection:
+    filtered_df = df
+else:
+    filtered_df = apply_filters(
+        tuple(sorted(industries)),
+        tuple(sorted(countries)),
+        tuple(sorted(tools)),
+        year_range[0],
+        year_range[1],
+    )
 
 if filtered_df.empty:
     st.warning("No data matches your filters. Try relaxing one or more filters.")
@@ -100,13 +234,13 @@ with col_kpi1:
 with col_kpi2:
     st.metric(
         "Avg Productivity Change (%)",
-        f"{filtered_df['Productivity_Change'].mean():.1f}",
+        f"{filtered_df['Productivity_Change'].to_numpy().mean():.1f}",
     )
 
 with col_kpi3:
     st.metric(
         "Avg Training Hours",
-        f"{filtered_df['Training_Hours'].mean():.0f}",
+        f"{filtered_df['Training_Hours'].to_numpy().mean():.0f}",
     )
 
 st.markdown("---")
@@ -121,40 +255,61 @@ rec_col1, rec_col2 = st.columns(2)
 with rec_col1:
     rec_industry = st.selectbox(
         "Industry for recommendation",
-        options=["(All industries)"] + sorted(df["Industry"].unique()),
+        options=options_with_all("Industry", "(All industries)"),
     )
 
 with rec_col2:
     rec_country = st.selectbox(
         "Country for recommendation",
-        options=["(All countries)"] + sorted(df["Country"].unique()),
+        options=options_with_all("Country", "(All countries)"),
     )
 
-rec_df = filtered_df.copy()
-
-if rec_industry != "(All industries)":
-    rec_df = rec_df[rec_df["Industry"] == rec_industry]
-
-if rec_country != "(All countries)":
-    rec_df = rec_df[rec_df["Country"] == rec_country]
+# Narrow in one step: AND the industry and country conditions into a
+# single mask so at most one row copy happens, instead of two chained
+# boolean-indexing passes each allocating an intermediate frame
+if rec_industry == "(All industries)" and rec_country == "(All countries)":
+    rec_df = filtered_df
+else:
+    rec_mask = np.ones(len(filtered_df), dtype=bool)
+    if rec_industry != "(All industries)":
+        rec_mask &= (filtered_df["Industry"] == rec_industry).to_numpy()
+    if rec_country != "(All countries)":
+        rec_mask &= (filtered_df["Country"] == rec_country).to_numpy()
+    rec_df = filtered_df.iloc[rec_mask]
 
 if rec_df.empty:
     st.info(
         "No records for that industry / country combination under the current filters."
     )
 else:
-    # Best tool by average productivity in this slice
-    by_tool = (
-        rec_df.groupby("GenAI_Tool")["Productivity_Change"]
-        .mean()
-        .reset_index()
-        .sort_values("Productivity_Change", ascending=False)
-    )
+    # Best tool by average productivity in this slice, read from the
+    # cached (industry, country) x tool cube. The cube is built once per
+    # filter selection; a recommendation slice just sums the matching
+    # cube rows, O(|industries| x |countries|) instead of O(rows).
+    tool_categories = df["GenAI_Tool"].cat.categories
+    cube_sums, cube_counts = prod_cube(filtered_df)
+
+    cube_rows = np.ones(len(cube_sums.index), dtype=bool)
+    if rec_industry != "(All industries)":
+        cube_rows &= (
+            cube_sums.index.get_level_values("Industry") == rec_industry
+        )
+    if rec_country != "(All countries)":
+        cube_rows &= (
+            cube_sums.index.get_level_values("Country") == rec_country
+        )
 
-    top_row = by_tool.iloc[0]
-    top_tool = top_row["GenAI_Tool"]
-    top_prod = top_row["Productivity_Change"]
-    n_recs = rec_df[rec_df["GenAI_Tool"] == top_tool].shape[0]
+    rec_sums = cube_sums.to_numpy()[cube_rows].sum(axis=0)
+    rec_counts = cube_counts.to_numpy()[cube_rows].sum(axis=0)
+    rec_means = np.where(
+        rec_counts > 0, rec_sums / np.maximum(rec_counts, 1), -np.inf
+    )
+    # argmax picks the winner directly; no sort, no DataFrame rebuild,
+    # and the count array already holds the matching record total
+    best = int(np.argmax(rec_means))
+    top_tool = tool_categories[best]
+    top_prod = float(rec_means[best])
+    n_recs = int(rec_counts[best])
 
     st.success(
         f"Based on your selections, **{top_tool}** has the highest average "
@@ -162,10 +317,12 @@ else:
         f"in this subset."
     )
 
-    # Planned training hours slider
-    min_train = int(rec_df["Training_Hours"].min())
-    max_train = int(rec_df["Training_Hours"].max())
-    median_train = int(rec_df["Training_Hours"].median())
+    # Planned training hours slider. The sorted view is cached per rec_df,
+    # and min/max fall out of it for free.
+    th_sorted, pc_sorted = training_sorted(rec_df)
+    min_train = int(th_sorted[0])
+    max_train = int(th_sorted[-1])
+    median_train = int(np.median(th_sorted))
 
     planned_hours = st.slider(
         "Planned training hours per employee",
@@ -174,16 +331,17 @@ else:
         value=median_train,
     )
 
-    # Companies with similar training hours (±10% of range, at least 50 hours)
+    # Companies with similar training hours (±10% of range, at least 50 hours).
+    # On the sorted array the window is two binary searches and a
+    # contiguous slice instead of a boolean mask over rec_df.
     train_range = max_train - min_train
     window = max(50, int(0.1 * train_range))
 
-    close_df = rec_df[
-        (rec_df["Training_Hours"] >= planned_hours - window)
-        & (rec_df["Training_Hours"] <= planned_hours + window)
-    ]
+    lo, hi = np.searchsorted(
+        th_sorted, [planned_hours - window, planned_hours + window + 1]
+    )
 
-    if close_df.empty:
+    if hi == lo:
         expected_prod = rec_df["Productivity_Change"].mean()
         st.write(
             f"There are no companies with training hours very close to **{planned_hours}**. "
@@ -191,7 +349,7 @@ else:
             f"**{expected_prod:.1f}%**."
         )
     else:
-        expected_prod = close_df["Productivity_Change"].mean()
+        expected_prod = float(pc_sorted[lo:hi].mean())
         st.write(
             f"For companies with **≈ {planned_hours}** training hours in this subset, "
             f"average productivity change has been about **{expected_prod:.1f}%**."
@@ -204,14 +362,26 @@ st.markdown("---")
 # --------------------------------------------------
 st.subheader("Companies Using Each GenAI Tool")
 
-tool_counts = (
-    filtered_df.groupby("GenAI_Tool")
-    .size()
-    .reset_index(name="Companies")
+tool_categories = df["GenAI_Tool"].cat.categories
+tool_sums, tool_counts_arr = group_sum_count(
+    filtered_df["GenAI_Tool"].cat.codes.to_numpy(),
+    filtered_df["Productivity_Change"].to_numpy(),
+    len(tool_categories),
+)
+tool_present = tool_counts_arr > 0
+
+# One frame feeds both bar charts; each chart slices out its columns
+per_tool = pd.DataFrame(
+    {
+        "GenAI_Tool": tool_categories[tool_present],
+        "Companies": tool_counts_arr[tool_present],
+        "Productivity_Change": tool_sums[tool_present]
+        / tool_counts_arr[tool_present],
+    }
 )
 
 chart_tools = (
-    alt.Chart(tool_counts)
+    alt.Chart(per_tool[["GenAI_Tool", "Companies"]])
     .mark_bar()
     .encode(
         x=alt.X("GenAI_Tool:N", title="GenAI Tool"),
@@ -228,14 +398,8 @@ st.altair_chart(chart_tools, use_container_width=True)
 # --------------------------------------------------
 st.subheader("Average Productivity Change by GenAI Tool")
 
-tool_productivity = (
-    filtered_df.groupby("GenAI_Tool")["Productivity_Change"]
-    .mean()
-    .reset_index()
-)
-
 chart_tool_productivity = (
-    alt.Chart(tool_productivity)
+    alt.Chart(per_tool[["GenAI_Tool", "Productivity_Change"]])
     .mark_bar()
     .encode(
         x=alt.X("GenAI_Tool:N", title="GenAI Tool"),
@@ -252,11 +416,74 @@ st.altair_chart(chart_tool_productivity, use_container_width=True)
 
 
 
+# --------------------------------------------------
+# Chart 3 — Training hours vs productivity change
+# --------------------------------------------------
+st.subheader("Training Hours vs Productivity Change")
+
+# Pre-aggregate server-side instead of shipping individual points: a 2D
+# histogram per tool keeps the payload fixed at ~50x40 cells per tool
+# regardless of how many rows match the filters, and the browser draws
+# rects instead of one scenegraph node per company
+scatter_th = filtered_df["Training_Hours"].to_numpy()
+scatter_pc = filtered_df["Productivity_Change"].to_numpy()
+scatter_codes = filtered_df["GenAI_Tool"].cat.codes.to_numpy()
+
+x_edges = np.linspace(scatter_th.min(), scatter_th.max() + 1, 51)
+y_edges = np.linspace(scatter_pc.min(), scatter_pc.max() + 1e-3, 41)
+
+bin_frames = []
+for code in np.flatnonzero(tool_present):
+    in_tool = scatter_codes == code
+    hist, _, _ = np.histogram2d(
+        scatter_th[in_tool], scatter_pc[in_tool], bins=[x_edges, y_edges]
+    )
+    xs, ys = np.nonzero(hist)
+    bin_frames.append(
+        pd.DataFrame(
+            {
+                "GenAI_Tool": tool_categories[code],
+                "Training_Hours": x_edges[xs],
+                "Training_Hours_end": x_edges[xs + 1],
+                "Productivity_Change": y_edges[ys],
+                "Productivity_Change_end": y_edges[ys + 1],
+                "Companies": hist[xs, ys].astype(int),
+            }
+        )
+    )
+
+bins_df = pd.concat(bin_frames, ignore_index=True)
+
+chart_scatter = (
+    alt.Chart(bins_df)
+    .mark_rect()
+    .encode(
+        x=alt.X("Training_Hours:Q", title="Training Hours"),
+        x2="Training_Hours_end:Q",
+        y=alt.Y("Productivity_Change:Q", title="Productivity Change (%)"),
+        y2="Productivity_Change_end:Q",
+        color=alt.Color("GenAI_Tool:N", title="GenAI Tool"),
+        opacity=alt.Opacity("Companies:Q", title="Companies"),
+        tooltip=[
+            "GenAI_Tool",
+            "Companies",
+            alt.Tooltip("Training_Hours:Q", format=".0f"),
+            alt.Tooltip("Productivity_Change:Q", format=".1f"),
+        ],
+    )
+    .properties(title="Training Hours vs Productivity Change")
+)
+
+st.altair_chart(chart_scatter, use_container_width=True)
+
 # --------------------------------------------------
 # Raw data
 # --------------------------------------------------
 with st.expander("Show raw filtered data"):
-    st.write(
+    # st.dataframe virtualizes rows in the browser, so the DOM stays
+    # bounded no matter how many rows pass the filters (st.write renders
+    # the whole frame to static HTML)
+    st.dataframe(
         filtered_df[
             [
                 "Company_Name",
@@ -270,5 +497,7 @@ with st.expander("Show raw filtered data"):
                 "Productivity_Change",
                 "Employee_Sentiment",
             ]
-        ]
+        ],
+        height=400,
+        use_container_width=True,
     )